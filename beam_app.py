@@ -10,6 +10,7 @@ Innehåller huvudklassen BeamWindow som är huvudfönstret för programmet samt
 import sys
 
 from qtpy.QtWidgets import QMainWindow, QApplication, QFileDialog
+from qtpy.QtCore import QTimer
 from qtpy import uic
 
 from beam_model import BeamModel
@@ -32,6 +33,20 @@ class BeamWindow(QMainWindow):
 
         uic.loadUi(resource_path("beam_app.ui"), self)
 
+        # Mappning mellan stödalternativ och stödkoder. Ersätter
+        # isChecked-stegarna vid läsning och skrivning av stöd.
+
+        self.left_support_options = [
+            (self.left_support_xy_option, BeamModel.FIXED_XY),
+            (self.left_support_y_option, BeamModel.FIXED_Y),
+            (self.left_support_xyr_option, BeamModel.FIXED_XYR),
+        ]
+        self.right_support_options = [
+            (self.right_support_xy_option, BeamModel.FIXED_XY),
+            (self.right_support_y_option, BeamModel.FIXED_Y),
+            (self.right_support_xyr_option, BeamModel.FIXED_XYR),
+        ]
+
         # Klassattribut
 
         self.filename = ""
@@ -49,6 +64,14 @@ class BeamWindow(QMainWindow):
         self.beam_view = BeamView(self.beam_model)
         self.main_layout.addWidget(self.beam_view)
 
+        # Timer som samlar ihop snabba ändringar i kontrollerna så
+        # att modellen bara löses om en gång när användaren är klar
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(30)
+        self.update_timer.timeout.connect(self.apply_model_changes)
+
         self.new_model()
 
         # Se till att check actions har rätt default värden
@@ -109,47 +132,85 @@ class BeamWindow(QMainWindow):
 
         self.beam_view.on_model_updated()
 
+    def set_text_if_changed(self, widget, text):
+        """Sätt text på en kontroll endast om texten ändrats"""
+
+        if widget.text() != text:
+            widget.setText(text)
+
     def update_controls(self):
         """Uppdatera kontroller med värden från balkmodell"""
 
-        self.segment_length_text.setText(
-            str(self.beam_model.lengths[self.current_beam])
-        )
-        self.calc_points_spin.setValue(self.beam_model.segments[self.current_beam])
-        self.segment_load_text.setText(str(self.beam_model.loads[self.current_beam]))
-
-        E_str = f"{self.beam_model.properties[self.current_beam][0]:.4e}"
-        A_str = f"{self.beam_model.properties[self.current_beam][1]:.4e}"
-        I_str = f"{self.beam_model.properties[self.current_beam][2]:.4e}"
-
-        self.e_text.setText(E_str)
-        self.a_text.setText(A_str)
-        self.i_text.setText(I_str)
-
-        if self.beam_model.supports[self.current_beam] == BeamModel.FIXED_XY:
-            self.left_support_xy_option.setChecked(True)
-        elif self.beam_model.supports[self.current_beam] == BeamModel.FIXED_Y:
-            self.left_support_y_option.setChecked(True)
-        elif self.beam_model.supports[self.current_beam] == BeamModel.FIXED_XYR:
-            self.left_support_xyr_option.setChecked(True)
-
-        if self.beam_model.supports[self.current_beam + 1] == BeamModel.FIXED_XY:
-            self.right_support_xy_option.setChecked(True)
-        elif self.beam_model.supports[self.current_beam + 1] == BeamModel.FIXED_Y:
-            self.right_support_y_option.setChecked(True)
-        elif self.beam_model.supports[self.current_beam + 1] == BeamModel.FIXED_XYR:
-            self.right_support_xyr_option.setChecked(True)
+        # Stäng av ommålning medan alla fält uppdateras så att
+        # fönstret bara ritas om en gång efteråt.
+
+        self.setUpdatesEnabled(False)
+
+        try:
+            self.set_text_if_changed(
+                self.segment_length_text,
+                str(self.beam_model.lengths[self.current_beam]),
+            )
+            self.calc_points_spin.setValue(self.beam_model.segments[self.current_beam])
+            self.set_text_if_changed(
+                self.segment_load_text, str(self.beam_model.loads[self.current_beam])
+            )
+
+            E_str = f"{self.beam_model.properties[self.current_beam][0]:.4e}"
+            A_str = f"{self.beam_model.properties[self.current_beam][1]:.4e}"
+            I_str = f"{self.beam_model.properties[self.current_beam][2]:.4e}"
+
+            self.set_text_if_changed(self.e_text, E_str)
+            self.set_text_if_changed(self.a_text, A_str)
+            self.set_text_if_changed(self.i_text, I_str)
+
+            for option, support in self.left_support_options:
+                if self.beam_model.supports[self.current_beam] == support:
+                    option.setChecked(True)
+                    break
+
+            for option, support in self.right_support_options:
+                if self.beam_model.supports[self.current_beam + 1] == support:
+                    option.setChecked(True)
+                    break
+        finally:
+            self.setUpdatesEnabled(True)
 
     def update_combo(self):
         """Uppdatera listbox med balksegment"""
 
-        self.segment_combo.clear()
+        # Justera antalet poster i stället för att tömma och fylla
+        # om hela listan. Befintliga poster återanvänds och får bara
+        # ny text via update_combo_labels. Signalerna blockeras så
+        # att removeItem/setCurrentIndex inte återinträder i
+        # on_segment_combo mitt i uppdateringen.
 
-        for i, item in enumerate(self.beam_model.segments):
-            beam_descr = f"{i+1}: {self.beam_model.lengths[i]} m"
-            self.segment_combo.addItem(beam_descr)
+        self.segment_combo.blockSignals(True)
+
+        try:
+            count = self.segment_combo.count()
+            n = len(self.beam_model.segments)
+
+            while count > n:
+                count -= 1
+                self.segment_combo.removeItem(count)
+
+            while count < n:
+                self.segment_combo.addItem("")
+                count += 1
+
+            self.update_combo_labels()
 
-        self.segment_combo.setCurrentIndex(self.current_beam)
+            # Utan signaler klampas inte aktuellt segment av
+            # on_segment_combo, så det görs här om segment tagits bort.
+
+            if self.current_beam >= n:
+                self.current_beam = n - 1
+                self.beam_view.selected_beam = self.current_beam
+
+            self.segment_combo.setCurrentIndex(self.current_beam)
+        finally:
+            self.segment_combo.blockSignals(False)
 
     def update_combo_labels(self):
         """Uppdatera texter i listbox"""
@@ -161,50 +222,85 @@ class BeamWindow(QMainWindow):
     def on_editing_finished(self, text=""):
         """Hantera ändringar i kontroller"""
 
+        # Starta om timern så att en skur av ändringar slås ihop
+        # till en enda omlösning av modellen.
+
+        self.update_timer.start()
+
+    def flush_pending_changes(self):
+        """Tillämpa väntande ändringar innan kontrollerna skrivs över"""
+
+        # Måste anropas innan segmentbyte, ny/öppna modell eller
+        # sparning, annars läser den väntande timern fel fältvärden
+        # eller så sparas en inaktuell modell.
+
+        if self.update_timer.isActive():
+            self.update_timer.stop()
+            self.apply_model_changes()
+
+    def apply_model_changes(self):
+        """Tillämpa ändringar i kontroller på modellen och lös om"""
+
         if self.current_beam != -1:
 
+            # Slå upp modellen och aktuellt segment en gång i stället
+            # för att gå via self.beam_model för varje åtkomst.
+
+            beam_model = self.beam_model
+            idx = self.current_beam
+            properties = beam_model.properties[idx]
+
             l_str = self.segment_length_text.text()
             q_str = self.segment_load_text.text()
             E_str = self.e_text.text()
             A_str = self.a_text.text()
             I_str = self.i_text.text()
 
-            l = self.beam_model.lengths[self.current_beam]
-            q = self.beam_model.loads[self.current_beam]
-            E = self.beam_model.properties[self.current_beam][0]
-            A = self.beam_model.properties[self.current_beam][1]
-            I = self.beam_model.properties[self.current_beam][2]
-
-            l = try_float(l_str, l)
-            q = try_float(q_str, q)
-            E = try_float(E_str, E)
-            A = try_float(A_str, A)
-            I = try_float(I_str, I)
-
-            self.beam_model.lengths[self.current_beam] = l
-            self.beam_model.loads[self.current_beam] = q
-            self.beam_model.properties[self.current_beam][0] = E
-            self.beam_model.properties[self.current_beam][1] = A
-            self.beam_model.properties[self.current_beam][2] = I
-            self.beam_model.segments[self.current_beam] = (
-                self.calc_points_spin.value()
-            )
-
-            if self.left_support_xy_option.isChecked():
-                self.beam_model.supports[self.current_beam] = BeamModel.FIXED_XY
-            elif self.left_support_y_option.isChecked():
-                self.beam_model.supports[self.current_beam] = BeamModel.FIXED_Y
-            elif self.left_support_xyr_option.isChecked():
-                self.beam_model.supports[self.current_beam] = BeamModel.FIXED_XYR
-
-            if self.right_support_xy_option.isChecked():
-                self.beam_model.supports[self.current_beam + 1] = BeamModel.FIXED_XY
-            elif self.right_support_y_option.isChecked():
-                self.beam_model.supports[self.current_beam + 1] = BeamModel.FIXED_Y
-            elif self.right_support_xyr_option.isChecked():
-                self.beam_model.supports[self.current_beam + 1] = BeamModel.FIXED_XYR
-
-            self.beam_model.solve()
+            l = try_float(l_str, beam_model.lengths[idx])
+            q = try_float(q_str, beam_model.loads[idx])
+            E = try_float(E_str, properties[0])
+            A = try_float(A_str, properties[1])
+            I = try_float(I_str, properties[2])
+            n = self.calc_points_spin.value()
+
+            left_support = beam_model.supports[idx]
+            right_support = beam_model.supports[idx + 1]
+
+            for option, support in self.left_support_options:
+                if option.isChecked():
+                    left_support = support
+                    break
+
+            for option, support in self.right_support_options:
+                if option.isChecked():
+                    right_support = support
+                    break
+
+            # Hoppa över omlösning och uppdatering av kontrollerna
+            # om inget värde faktiskt har ändrats.
+
+            if (
+                l == beam_model.lengths[idx]
+                and q == beam_model.loads[idx]
+                and E == properties[0]
+                and A == properties[1]
+                and I == properties[2]
+                and n == beam_model.segments[idx]
+                and left_support == beam_model.supports[idx]
+                and right_support == beam_model.supports[idx + 1]
+            ):
+                return
+
+            beam_model.lengths[idx] = l
+            beam_model.loads[idx] = q
+            properties[0] = E
+            properties[1] = A
+            properties[2] = I
+            beam_model.segments[idx] = n
+            beam_model.supports[idx] = left_support
+            beam_model.supports[idx + 1] = right_support
+
+            beam_model.solve()
             self.beam_view.on_model_updated()
 
             self.update_controls()
@@ -218,6 +314,8 @@ class BeamWindow(QMainWindow):
     def on_segment_combo(self, idx):
         """Händelsemetod för att hantera val i listbox"""
 
+        self.flush_pending_changes()
+
         self.current_beam = idx
         self.beam_view.selected_beam = idx
         self.update_controls()
@@ -225,6 +323,8 @@ class BeamWindow(QMainWindow):
     def on_new(self):
         """Händelsemetod för att skapa en ny modell"""
 
+        self.flush_pending_changes()
+
         self.new_model()
         self.update_controls()
 
@@ -235,6 +335,8 @@ class BeamWindow(QMainWindow):
     def on_open(self):
         """Händelsemetod för att öppna en modell"""
 
+        self.flush_pending_changes()
+
         self.filename, _ = QFileDialog.getOpenFileName(
             self, "Öppna modell", "", "Modell filer (*.json *.jpg *.bmp)"
         )
@@ -249,6 +351,8 @@ class BeamWindow(QMainWindow):
     def on_save(self):
         """Händelsemetod för spara modellfil"""
 
+        self.flush_pending_changes()
+
         if self.filename == "":
             self.filename, _ = QFileDialog.getSaveFileName(
                 self, "Spara modell", "", "Modell filer (*.json)"
@@ -260,6 +364,8 @@ class BeamWindow(QMainWindow):
     def on_save_as(self):
         """Händelsemetod för att spara som ..."""
 
+        self.flush_pending_changes()
+
         temp_filename, _ = QFileDialog.getSaveFileName(
             self, "Spara modell", "", "Modell filer (*.json)"
         )
@@ -291,6 +397,8 @@ class BeamWindow(QMainWindow):
     def on_add_beam(self):
         """Händelsemetod för att lägga till en balk"""
 
+        self.flush_pending_changes()
+
         self.beam_model.add_beam()
         self.beam_view.on_model_updated()
 
@@ -300,6 +408,8 @@ class BeamWindow(QMainWindow):
     def on_remove_beam(self):
         """Händelsemetod för att ta bort en balk"""
 
+        self.flush_pending_changes()
+
         self.beam_model.remove_beam()
         self.beam_view.on_model_updated()
 
@@ -45,7 +45,11 @@ class BeamModel(object):
             BeamModel.FIXED_Y,
         ]
         self.loads = [1.0e3, 1.0e3, 0.5e3]
-        self.properties = [[E, A, I], [E, A, I], [E, A, I]]
+
+        # Materialegenskaper lagras som en (N, 3)-array med en rad
+        # [E, A, I] per segment för vektoriserad åtkomst.
+
+        self.properties = np.array([[E, A, I], [E, A, I], [E, A, I]])
 
         # Attribut som lagrar värden som tas fram vid beräkningen
         # och som behövs för att kunna rita upp modellen i
@@ -69,7 +73,7 @@ class BeamModel(object):
         self.segments.append(self.segments[-1])
         self.loads.append(self.loads[-1])
         self.supports.append(BeamModel.FIXED_Y)
-        self.properties.append(self.properties[-1])
+        self.properties = np.vstack((self.properties, self.properties[-1]))
         self.solve()
 
     def remove_beam(self):
@@ -80,7 +84,7 @@ class BeamModel(object):
             self.segments.pop()
             self.loads.pop()
             self.supports.pop()
-            self.properties.pop()
+            self.properties = self.properties[:-1]
             self.solve()
 
     def solve(self):
@@ -92,10 +96,8 @@ class BeamModel(object):
         A = 0.1 * 0.1
         I = 0.1 * (0.1**3) / 12
 
-        if self.properties == None:
-            self.properties = []
-            for i in enumerate(self.segments):
-                self.properties.append([E, A, I])
+        if self.properties is None:
+            self.properties = np.tile([E, A, I], (len(self.segments), 1))
 
         # Beräkna antal element och frihetsgrader
 
@@ -148,6 +150,15 @@ class BeamModel(object):
         for l, n, q, p in zip(self.lengths, self.segments, self.loads, self.properties):
             l_n = l / n
             self.support_dofs.append([dof, dof + 1, dof + 2])
+
+            # Alla element i ett segment är identiska (samma längd,
+            # egenskaper och last), så elementstyvheten behöver bara
+            # beräknas en gång per segment.
+
+            Ke, fe = cfc.beam2e(
+                np.array([0.0, l_n]), np.array([0.0, 0.0]), p, [0.0, -q]
+            )
+
             for i in range(n):
 
                 # Tilldela elementkoordinater
@@ -158,10 +169,6 @@ class BeamModel(object):
                 eq[el, :] = [0.0, -q]
                 x += l_n
 
-                # Beräkna element styvhet
-
-                Ke, fe = cfc.beam2e(ex[el, :], ey[el, :], ep[el, :], eq[el, :])
-
                 # Tilldela elementtopologi
 
                 etopo = np.array([dof, dof + 1, dof + 2, dof + 3, dof + 4, dof + 5])
@@ -240,7 +247,7 @@ class BeamModel(object):
         beam_dict["segments"] = self.segments
         beam_dict["loads"] = self.loads
         beam_dict["supports"] = self.supports
-        beam_dict["properties"] = self.properties
+        beam_dict["properties"] = self.properties.tolist()
 
         with open(filename, "w") as json_file:
             json.dump(beam_dict, json_file, sort_keys=True, indent=4)
@@ -254,7 +261,7 @@ class BeamModel(object):
             self.segments = beam_dict["segments"]
             self.loads = beam_dict["loads"]
             self.supports = beam_dict["supports"]
-            self.properties = beam_dict["properties"]
+            self.properties = np.asarray(beam_dict["properties"], float)
 
     def find_beam(self, x):
         """Find beam segment"""
@@ -6,13 +6,17 @@ Modul med diverse hjälpfunktioner för att hantera strängar, tal och listor.
 import os, sys
 import ctypes
 
+from functools import lru_cache
 
+
+@lru_cache(maxsize=256)
 def try_float(text, default=0.0):
     try:
         return float(text)
     except ValueError:
         return default
     
+@lru_cache(maxsize=None)
 def resource_path(relative_path):
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
@@ -5,7 +5,7 @@ Uppritningskontroll för balkmodell (QWidget)
 Implementerar en QWidget för att rita en balkmodell. Klassen hanterar uppritning av balkar, stöd, laster, moment, förskjutningar och dimensioner. Klassen är avsedd att användas som en del av en PyQt-applikation för att visualisera en balkmodell.
 """
 
-from qtpy.QtGui import QPainter, QColor
+from qtpy.QtGui import QPainter, QPicture, QColor
 from qtpy.QtCore import Qt
 
 from draw_view import DrawView
@@ -37,6 +37,9 @@ class BeamView(DrawView):
 
         self.__on_beam_selected = None
 
+        # Cachad uppritning av de modellberoende diagrammen
+        self.__diagram_cache = None
+
         self.__update_scale_factors()
 
     def __update_scale_factors(self):
@@ -78,9 +81,21 @@ class BeamView(DrawView):
 
     def on_model_updated(self):
         self.__update_scale_factors()
+        self.invalidate_diagram_cache()
         self.update()
 
-    def draw_beams(self):
+    def invalidate_diagram_cache(self):
+        """Ogiltigförklara den cachade diagramuppritningen"""
+        self.__diagram_cache = None
+
+    def resizeEvent(self, event):
+        """Handle resize event"""
+
+        # Transformen ändras med storleken, så cachen måste ritas om
+        self.invalidate_diagram_cache()
+        super().resizeEvent(event)
+
+    def draw_beams(self, painter):
 
         # Draw beam
         self.stroke_color = Qt.black
@@ -96,7 +111,7 @@ class BeamView(DrawView):
             
             self.stroke_color = Qt.black
             self.stroke_width = 2.0
-            self.line(x0, y0, x1, y1)
+            self.line(painter, x0, y0, x1, y1)
 
             if self.current_beam == i:
 
@@ -105,7 +120,7 @@ class BeamView(DrawView):
                 self.fill_color = QColor(128, 128, 0, 64)              
                 self.stroke = False
 
-                self.rect(x0-self.dim_dist*0.5, y0-self.dim_dist*0.5, length+(self.dim_dist), self.dim_dist)
+                self.rect(painter, x0-self.dim_dist*0.5, y0-self.dim_dist*0.5, length+(self.dim_dist), self.dim_dist)
 
                 self.pop_attributes()
 
@@ -116,12 +131,12 @@ class BeamView(DrawView):
                 self.fill_color = QColor(128, 128, 0, 64)              
                 self.stroke = False
 
-                self.rect(x0-self.dim_dist*0.5, y0-self.dim_dist*0.5, length+(self.dim_dist), self.dim_dist)
+                self.rect(painter, x0-self.dim_dist*0.5, y0-self.dim_dist*0.5, length+(self.dim_dist), self.dim_dist)
 
                 self.pop_attributes()
 
 
-    def draw_dimensions(self):
+    def draw_dimensions(self, painter):
 
         # Draw dimensions
         self.stroke_color = Qt.black
@@ -137,8 +152,9 @@ class BeamView(DrawView):
             x = sum(self.beam_model.lengths[:i])
             y = 0
 
-            self.line(x, y_start, x, y_end)
+            self.line(painter, x, y_start, x, y_end)
             self.arrow(
+                painter,
                 x,
                 y_dim_line,
                 x + self.beam_model.lengths[i],
@@ -146,6 +162,7 @@ class BeamView(DrawView):
                 arrow_size=self.dim_dist * 0.5,
             )
             self.text(
+                painter,
                 x + self.beam_model.lengths[i] / 2,
                 y_dim_line + self.dim_dist * 0.5,
                 f"{self.beam_model.lengths[i]:.2f}",
@@ -155,9 +172,9 @@ class BeamView(DrawView):
             )
 
         x += self.beam_model.lengths[-1]
-        self.line(x, y_start, x, y_end)
+        self.line(painter, x, y_start, x, y_end)
 
-    def draw_supports(self):
+    def draw_supports(self, painter):
 
         # Draw supports
         self.stroke_color = Qt.black
@@ -169,13 +186,13 @@ class BeamView(DrawView):
             y = 0
 
             if support == BeamModel.FIXED_XY:
-                self.draw_support(x, y)
+                self.draw_support(painter, x, y)
             elif support == BeamModel.FIXED_Y:
-                self.draw_support(x, y, roller=True)
+                self.draw_support(painter, x, y, roller=True)
             elif support == BeamModel.FIXED_XYR:
-                self.draw_support(x, y, fixed=True)
+                self.draw_support(painter, x, y, fixed=True)
 
-    def draw_loads(self):
+    def draw_loads(self, painter):
         # Draw loads
         self.stroke_color = QColor(128, 50, 50)
         self.fill_color = QColor(128, 50, 50, 64)
@@ -189,6 +206,7 @@ class BeamView(DrawView):
             q = load / self.beam_model.lengths[i]
 
             self.draw_load(
+                painter,
                 x,
                 self.beam_model.lengths[i],
                 (load / self.max_abs_load) * self.max_height,
@@ -196,6 +214,7 @@ class BeamView(DrawView):
 
             if load > 0:
                 self.text(
+                    painter,
                     x + self.beam_model.lengths[i] / 2,
                     (load / self.max_abs_load) * self.max_height + self.dim_dist,
                     f"q = {load:.0f} N/m",
@@ -205,6 +224,7 @@ class BeamView(DrawView):
                 )
             else:
                 self.text(
+                    painter,
                     x + self.beam_model.lengths[i] / 2,
                     (load / self.max_abs_load) * self.max_height,
                     f"q = {load:.0f} N/m",
@@ -213,7 +233,7 @@ class BeamView(DrawView):
                     vert_align="top",
                 )
 
-    def draw_moments(self):
+    def draw_moments(self, painter):
 
         # Draw moments
         self.stroke_color = QColor(50, 128, 50)
@@ -226,36 +246,48 @@ class BeamView(DrawView):
             y0 = self.max_height * self.beam_model.NVM[i, 1] / self.y_max
             y1 = self.max_height * self.beam_model.NVM[i + 1, 1] / self.y_max
 
-            self.line(x0, y0, x1, y1)
+            self.line(painter, x0, y0, x1, y1)
 
-    def on_draw(self):
+    def on_draw(self, painter):
         """Draw the widget"""
 
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setTransform(self.transform)
+        # De modellberoende diagrammen ritas in i en QPicture som
+        # spelas upp tills modellen, vyn eller visningsvalen ändras.
+        # Markeringen av aktuellt segment ritas alltid direkt.
+
+        if self.__diagram_cache is None:
+
+            picture = QPicture()
+            pic_painter = QPainter(picture)
+            pic_painter.setRenderHint(QPainter.Antialiasing)
+
+            if self.show_loads:
+                self.draw_loads(pic_painter)
+            if self.show_displacement:
+                self.draw_displacement(pic_painter)
+            if self.show_moments:
+                self.draw_moments(pic_painter)
+            if self.show_section_force:
+                self.draw_section_force(pic_painter)
 
-        if self.show_loads:
-            self.draw_loads()
-        if self.show_displacement:
-            self.draw_displacement()
-        if self.show_moments:
-            self.draw_moments()
-        if self.show_section_force:
-            self.draw_section_force()
+            self.draw_supports(pic_painter)
 
-        self.draw_supports()
-        self.draw_beams()
+            if self.show_dimensions:
+                self.draw_dimensions(pic_painter)
 
-        if self.show_dimensions:
-            self.draw_dimensions()
+            pic_painter.end()
+            self.__diagram_cache = picture
 
-    def draw_support(self, x, y, roller=False, fixed=False):
+        painter.drawPicture(0, 0, self.__diagram_cache)
+
+        self.draw_beams(painter)
+
+    def draw_support(self, painter, x, y, roller=False, fixed=False):
         """Draw a support at position x, y with angle and radius"""
 
         if roller:
-            self.circle(x, y - self.support_size * 0.5, self.support_size * 0.5)
-            self.line(
+            self.circle(painter, x, y - self.support_size * 0.5, self.support_size * 0.5)
+            self.line(painter, 
                 x - self.support_size,
                 y - self.support_size,
                 x + self.support_size,
@@ -263,64 +295,62 @@ class BeamView(DrawView):
             )
         else:
             if fixed:
-                self.line(x, y - self.support_size, x, y + self.support_size)
+                self.line(painter, x, y - self.support_size, x, y + self.support_size)
             else:
-                self.triangle(x, y, self.support_size, self.support_size)
-                self.line(
+                self.triangle(painter, x, y, self.support_size, self.support_size)
+                self.line(painter, 
                     x - self.support_size,
                     y - self.support_size,
                     x + self.support_size,
                     y - self.support_size,
                 )
 
-    def draw_load(self, x, w, h):
+    def draw_load(self, painter, x, w, h):
         """Draw a load at position x, y with angle and radius"""
 
-        self.rect(x, 0, w, h)
-        self.line(x + w / 2, h, x + w / 2, 0.0)
+        self.rect(painter, x, 0, w, h)
+        self.line(painter, x + w / 2, h, x + w / 2, 0.0)
 
         if h > 0.0:
-            self.line(
+            self.line(painter, 
                 x + w / 2,
                 0.0,
                 x + w / 2 - self.support_size * 0.5,
                 self.support_size * 0.5,
             )
-            self.line(
+            self.line(painter, 
                 x + w / 2,
                 0.0,
                 x + w / 2 + self.support_size * 0.5,
                 self.support_size * 0.5,
             )
         else:
-            self.line(
+            self.line(painter, 
                 x + w / 2,
                 0.0,
                 x + w / 2 - self.support_size * 0.5,
                 -self.support_size * 0.5,
             )
-            self.line(
+            self.line(painter, 
                 x + w / 2,
                 0.0,
                 x + w / 2 + self.support_size * 0.5,
                 -self.support_size * 0.5,
             )
 
-    def draw_displacement(self):
+    def draw_displacement(self, painter):
         # Draw displacements
         self.stroke_color = QColor(128, 50, 50)
         self.fill_color = QColor(128, 50, 50, 64)
         self.stroke_width = 2.0
 
-        for i in range(len(self.beam_model.x) - 1):
-            x0 = self.beam_model.x[i]
-            x1 = self.beam_model.x[i + 1]
-            y0 = self.max_height * self.beam_model.y_displ[i] / self.y_max
-            y1 = self.max_height * self.beam_model.y_displ[i + 1] / self.y_max
-
-            self.line(x0, y0, x1, y1)
+        self.polyline_world(
+            painter,
+            self.beam_model.x,
+            self.max_height * self.beam_model.y_displ.ravel() / self.y_max,
+        )
 
-    def draw_moments(self):
+    def draw_moments(self, painter):
 
         # Draw moments
         self.stroke_color = QColor(50, 128, 50)
@@ -339,9 +369,9 @@ class BeamView(DrawView):
             (np.array([0.0, 0.0]), points, np.array([self.beam_model.x[-1], 0.0]))
         )
 
-        self.polygon(points)
+        self.polygon(painter, points)
 
-    def draw_section_force(self):
+    def draw_section_force(self, painter):
 
         # Draw moments
         self.stroke_color = QColor(50, 50, 128)
@@ -361,7 +391,7 @@ class BeamView(DrawView):
             (np.array([0.0, 0.0]), points, np.array([self.beam_model.x[-1], 0.0]))
         )
 
-        self.polygon(points)
+        self.polygon(painter, points)
 
     @property
     def total_length(self):
@@ -410,6 +440,7 @@ class BeamView(DrawView):
     @show_loads.setter
     def show_loads(self, show):
         self.__show_loads = show
+        self.invalidate_diagram_cache()
         self.update()
 
     @property
@@ -419,6 +450,7 @@ class BeamView(DrawView):
     @show_displacement.setter
     def show_displacement(self, show):
         self.__show_displacement = show
+        self.invalidate_diagram_cache()
         self.update()
 
     @property
@@ -428,6 +460,7 @@ class BeamView(DrawView):
     @show_moments.setter
     def show_moments(self, show):
         self.__show_moments = show
+        self.invalidate_diagram_cache()
         self.update()
 
     @property
@@ -437,6 +470,7 @@ class BeamView(DrawView):
     @show_section_force.setter
     def show_section_force(self, show):
         self.__show_section_force = show
+        self.invalidate_diagram_cache()
         self.update()
 
     @property
@@ -446,6 +480,7 @@ class BeamView(DrawView):
     @show_dimensions.setter
     def show_dimensions(self, show):
         self.__show_dimensions = show
+        self.invalidate_diagram_cache()
         self.update()
 
     @property
@@ -8,11 +8,20 @@ Klassen är avsedd att användas som en bas för att skapa anpassade uppritnings
 """
 
 from qtpy.QtWidgets import QWidget
-from qtpy.QtGui import QPainter, QTransform, QPen, QBrush, QFont
-from qtpy.QtCore import Qt, QPointF, QRectF
+from qtpy.QtGui import QPainter, QTransform, QPen, QBrush, QFont, QFontMetrics, QPolygonF
+from qtpy.QtCore import Qt, QPointF, QRectF, QLineF
+
+import numpy as np
 
 
 class DrawView(QWidget):
+
+    # Justeringsfaktorer för text(). Faktorn anger hur stor andel av
+    # textens bredd respektive höjd som ankarpunkten förskjuts.
+
+    HOR_ALIGN_FACTORS = {"left": 0.0, "center": 0.5, "right": 1.0}
+    VERT_ALIGN_FACTORS = {"top": 1.0, "middle": 0.5, "bottom": 0.0}
+
     def __init__(self):
         """DrawWidget konstruktor"""
         super().__init__()
@@ -33,14 +42,22 @@ class DrawView(QWidget):
         self.no_fill_brush = QBrush(Qt.NoBrush)
         self.no_stroke_pen = QPen(Qt.NoPen)
 
-        self.__current_pen = self.stroke_pen
-        self.__current_brush = self.fill_brush
+        # Vanliga attribut i stället för properties; de läses i
+        # varje primitiv och har inga sidoeffekter vid tilldelning.
+        self.current_pen = self.stroke_pen
+        self.current_brush = self.fill_brush
 
         self.__attribute_stack = []
 
         self.font = QFont()
         self.text_pen = QPen(self.__text_color)
 
+        # Cachead font och fontmått för text(). Räknas bara om
+        # när pixelstorleken ändras.
+        self.__text_font = QFont()
+        self.__text_font_px = -1
+        self.__text_metrics = None
+
         self.setMouseTracking(True)
 
     def __update_transform(self):
@@ -57,6 +74,9 @@ class DrawView(QWidget):
         # Skala för att passa vyn samtidigt som aspektförhållandet bibehålls
         scale_x = viewport.width() / self.world_bounds.width()
         scale_y = viewport.height() / self.world_bounds.height()
+
+        # Skalan är alltid positiv (bredd och höjd är positiva);
+        # spegelvändningen av Y-axeln ligger i transformen, inte här.
         self.scale = min(scale_x, scale_y)
 
         # Centrera innehållet
@@ -72,6 +92,17 @@ class DrawView(QWidget):
             -self.world_bounds.center().x(), -self.world_bounds.center().y()
         )
 
+        # Cachea den inverterade transformen så att window_to_world
+        # slipper räkna om matrisinversen vid varje mushändelse.
+        self._inv_transform, _ = self.transform.inverted()
+
+        # Cachea transformen som en 2x3-matris för vektoriserad
+        # transformering av koordinatarrayer med NumPy.
+        t = self.transform
+        self._m = np.array(
+            [[t.m11(), t.m21(), t.dx()], [t.m12(), t.m22(), t.dy()]]
+        )
+
     def mouseMoveEvent(self, event):
         self.current_mouse_pos = self.window_to_world(event.x(), event.y())
         self.on_mouse_move(self.current_mouse_pos.x(), self.current_mouse_pos.y())
@@ -99,9 +130,10 @@ class DrawView(QWidget):
         painter.setBackground(Qt.white)
         painter.fillRect(0, 0, self.width(), self.height(), Qt.white)
 
-        # Delegera uppritning till underklassen
+        # Delegera uppritning till underklassen. Samma painter
+        # återanvänds för alla primitiver under uppritningen.
 
-        self.on_draw()
+        self.on_draw(painter)
 
     def on_mouse_move(self, x, y):
         """Metod för att implementera musrörelse i underklasser"""
@@ -115,7 +147,7 @@ class DrawView(QWidget):
         """Metod för att implementera musklick i underklasser"""
         pass
 
-    def on_draw(self):
+    def on_draw(self, painter):
         """Metod för att implementera uppritning i underklasser"""
         pass
 
@@ -134,11 +166,19 @@ class DrawView(QWidget):
 
     def window_to_world(self, x, y):
         """Konvertera fönsterkoordinater till världskoordinater"""
-        return self.transform.inverted()[0].map(QPointF(x, y))
+        return self._inv_transform.map(QPointF(x, y))
 
     def world_to_window(self, x, y):
         """Konvertera världskoordinater till fönsterkoordinater"""
         return self.transform.map(QPointF(x, y))
+
+    def world_to_window_array(self, xs, ys):
+        """Konvertera arrayer av världskoordinater till fönsterkoordinater"""
+        m = self._m
+        return (
+            m[0, 0] * xs + m[0, 1] * ys + m[0, 2],
+            m[1, 0] * xs + m[1, 1] * ys + m[1, 2],
+        )
     
     def push_attributes(self):
         """Spara aktuella attributinställningar"""
@@ -164,51 +204,66 @@ class DrawView(QWidget):
             self.current_pen = self.stroke_pen if self.stroke else self.no_stroke_pen
             self.current_brush = self.fill_brush if self.fill else self.no_fill_brush
 
-    def painter(self):
-        """Returnera ett anpassat QPainter-objekt för kontrollen"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def apply_attributes(self, painter):
+        """Tilldela aktuell penna och pensel till painter"""
         painter.setPen(self.current_pen)
         painter.setBrush(self.current_brush)
-        return painter
 
-    def polygon(self, points):
+    def polygon(self, painter, points):
         """Rita en polygon med punkter"""
 
-        painter = self.painter()
-        # Transformera punkterna men inte pennan
-        mapped_points = [self.transform.map(QPointF(x, y)) for x, y in points]
-        painter.drawPolygon(mapped_points)
+        self.apply_attributes(painter)
+        # Transformera alla hörn i ett enda anrop i stället för punktvis.
+        # QPointF binds lokalt för att undvika globaluppslag per hörn.
+        point = QPointF
+        poly = QPolygonF([point(x, y) for x, y in points])
+        painter.drawPolygon(self.transform.map(poly))
+
+    def polyline_world(self, painter, xs, ys):
+        """Rita en polylinje från arrayer av världskoordinater"""
 
-    def line(self, x1, y1, x2, y2):
+        self.apply_attributes(painter)
+        # Transformera alla punkter vektoriserat med NumPy
+        sx, sy = self.world_to_window_array(np.asarray(xs), np.asarray(ys))
+        point = QPointF
+        poly = QPolygonF([point(x, y) for x, y in zip(sx, sy)])
+        painter.drawPolyline(poly)
+
+    def line(self, painter, x1, y1, x2, y2):
         """Rita en linje"""
-        painter = self.painter()
+        self.apply_attributes(painter)
         # Transformera punkterna men inte pennan
-        p1 = self.transform.map(QPointF(x1, y1))
-        p2 = self.transform.map(QPointF(x2, y2))
+        tmap = self.transform.map
+        p1 = tmap(QPointF(x1, y1))
+        p2 = tmap(QPointF(x2, y2))
         painter.drawLine(p1, p2)
 
-    def arrow(self, x1, y1, x2, y2, arrow_size=5, arrow_start=True, arrow_end=True):
+    def arrow(self, painter, x1, y1, x2, y2, arrow_size=5, arrow_start=True, arrow_end=True):
         """Rita en pil"""
-        painter = QPainter(self)
+        self.apply_attributes(painter)
 
         # Transformera punkterna men inte pennan
-        p1 = self.transform.map(QPointF(x1, y1))
-        p2 = self.transform.map(QPointF(x2, y2))
-        painter.drawLine(p1, p2)
+        tmap = self.transform.map
+        p1 = tmap(QPointF(x1, y1))
+        p2 = tmap(QPointF(x2, y2))
+
+        # Samla alla segment och rita dem med ett enda drawLines-anrop
 
-        # Rita pilhuvudet i skärmkoordinater
+        lines = [QLineF(p1, p2)]
+
+        # Beräkna pilhuvudet i skärmkoordinater
         dx = p2.x() - p1.x()
         dy = p2.y() - p1.y()
         length = (dx**2 + dy**2) ** 0.5
         if length == 0:
+            painter.drawLines(lines)
             return
 
         # Normalisera riktningsvektorn
         dx /= length
         dy /= length
 
-        s_arrow_size = arrow_size * abs(self.scale)
+        s_arrow_size = arrow_size * self.scale
 
         # Beräkna pilhuvudpunkter (i skärmkoordinater)
 
@@ -222,8 +277,8 @@ class DrawView(QWidget):
                 p2.y() - dy * s_arrow_size + dx * s_arrow_size / 2,
             )
 
-            painter.drawLine(p2, p3)
-            painter.drawLine(p2, p4)
+            lines.append(QLineF(p2, p3))
+            lines.append(QLineF(p2, p4))
 
         if arrow_start:
             p5 = QPointF(
@@ -234,82 +289,87 @@ class DrawView(QWidget):
                 p1.x() + dx * s_arrow_size - dy * s_arrow_size / 2,
                 p1.y() + dy * s_arrow_size + dx * s_arrow_size / 2,
             )
-            painter.drawLine(p1, p5)
-            painter.drawLine(p1, p6)
+            lines.append(QLineF(p1, p5))
+            lines.append(QLineF(p1, p6))
+
+        painter.drawLines(lines)
 
-    def rect(self, x, y, w, h):
+    def rect(self, painter, x, y, w, h):
         """Rita en rektangel"""
 
-        painter = self.painter()
+        self.apply_attributes(painter)
         # Transformera punkterna men inte pennan
-        p1 = self.transform.map(QPointF(x, y))
-        p2 = self.transform.map(QPointF(x + w, y + h))
+        tmap = self.transform.map
+        p1 = tmap(QPointF(x, y))
+        p2 = tmap(QPointF(x + w, y + h))
         painter.drawRect(QRectF(p1, p2))
 
-    def circle(self, x, y, r):
+    def circle(self, painter, x, y, r):
         """Rita en cirkel"""
 
-        painter = self.painter()
+        self.apply_attributes(painter)
         # Transformera punkterna men inte pennan
         p = self.transform.map(QPointF(x, y))
-        screen_r = r * abs(self.scale)
+        screen_r = r * self.scale
         painter.drawEllipse(
             QRectF(p.x() - screen_r, p.y() - screen_r, 2 * screen_r, 2 * screen_r)
         )
 
-    def triangle(self, x, y, w, h):
+    def triangle(self, painter, x, y, w, h):
         """Rita en triangel"""
 
-        painter = self.painter()
+        self.apply_attributes(painter)
         # Transformera punkterna men inte pennan
-        p1 = self.transform.map(QPointF(x, y))
-        p2 = self.transform.map(QPointF(x + w / 2, y - h))
-        p3 = self.transform.map(QPointF(x - w / 2, y - h))
+        tmap = self.transform.map
+        p1 = tmap(QPointF(x, y))
+        p2 = tmap(QPointF(x + w / 2, y - h))
+        p3 = tmap(QPointF(x - w / 2, y - h))
 
         painter.drawPolygon([p1, p2, p3])
 
-    def text(self, x, y, text, font_size=12, hor_align="left", vert_align="middle"):
+    def text(self, painter, x, y, text, font_size=12, hor_align="left", vert_align="middle"):
         """
         Rita text i världskoordinater med skärmpixelstorlek på fonten
 
         Parametrar:
+            painter: QPainter att rita med
             x, y: Världskoordinater för textposition
             text: Sträng att visa
             font_size: Storlek i skärmpixlar (standard: 12)
             hor_align: Horisontell justering - "left", "right" eller "center" (standard: "left")
             vert_align: Vertikal justering - "top", "middle" eller "bottom" (standard: "middle")
         """
-        painter = QPainter(self)
 
-        # Ställ in fonten
-        font = painter.font()
-        font.setPixelSize(font_size * abs(self.scale))
-        painter.setFont(font)
+        # Ställ in fonten från cachen i stället för att skapa en ny
+        # font per anrop
+        pixel_size = round(font_size * self.scale)
+        if pixel_size != self.__text_font_px:
+            self.__text_font_px = pixel_size
+            self.__text_font.setPixelSize(max(pixel_size, 1))
+            self.__text_metrics = QFontMetrics(self.__text_font)
+
+        # Spara painterns tillstånd i stället för att växla penna
+        # fram och tillbaka
+        painter.save()
+        painter.setFont(self.__text_font)
 
         # Hämta textmått för justering
-        metrics = painter.fontMetrics()
+        metrics = self.__text_metrics
         text_width = metrics.horizontalAdvance(text)
         text_height = metrics.height()
 
         # Transformera ankarpunkten från värld till skärmkoordinater
         p = self.transform.map(QPointF(x, y))
 
-        # Justera x-position baserat på horisontell justering
-        if hor_align == "right":
-            p.setX(p.x() - text_width)
-        elif hor_align == "center":
-            p.setX(p.x() - text_width / 2)
-
-        # Justera y-position baserat på vertikal justering
-        if vert_align == "top":
-            p.setY(p.y() + text_height)
-        elif vert_align == "middle":
-            p.setY(p.y() + text_height / 2)
-        # För bottenjustering behövs ingen justering eftersom Qt ritar från botten
+        # Justera positionen med faktortabellerna i stället för
+        # grenar per justeringsläge. Qt ritar text från baslinjen,
+        # så "bottom" ger faktorn 0.
+        p.setX(p.x() - text_width * self.HOR_ALIGN_FACTORS[hor_align])
+        p.setY(p.y() + text_height * self.VERT_ALIGN_FACTORS[vert_align])
 
         painter.setPen(self.text_pen)
         painter.drawText(p, text)
-        painter.setPen(self.stroke_pen)
+        painter.restore()
 
     @property
     def stroke_color(self):
@@ -362,24 +422,6 @@ class DrawView(QWidget):
         self.__stroke_width = width
         self.stroke_pen.setWidth(width)
 
-    @property
-    def current_pen(self):
-        return self.__current_pen
-    
-    @current_pen.setter
-    def current_pen(self, pen):
-        self.__current_pen = pen
-        #painter = self.painter()
-
-    @property
-    def current_brush(self):
-        return self.__current_brush
-    
-    @current_brush.setter
-    def current_brush(self, brush):
-        self.__current_brush = brush
-        #painter = self.painter()
-
     @property
     def text_color(self):
         return self.__font_color